@@ -1,18 +1,77 @@
 import argparse
 import json
 import os
+import re
 import sys
 import datetime
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Optional
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import google.generativeai as genai
 
 # --- 1. Path & Config Setup ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(SCRIPT_DIR)
 CONFIG_PATH = os.path.join(ROOT_DIR, "config.json")
+ETAG_CACHE_PATH = os.path.join(ROOT_DIR, ".http_cache.json")
 
 # NOTE: Calendar integration planned for future release
 
+# Each run is a single short invocation, so the month name is computed once
+CURRENT_MONTH_NAME = datetime.datetime.now().strftime("%B %Y")
+
+# Shared HTTP session: all traffic goes to the same two Craft hosts, so reuse
+# pooled keep-alive connections instead of a fresh TLS handshake per request.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # Inserts aren't idempotent: a 5xx may arrive after the write was applied,
+        # so POSTs are only retried on 429 (see insert_blocks)
+        allowed_methods=["GET"],
+        # Hand the last response back so callers' raise_for_status() reports it
+        raise_on_status=False
+    )
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+SESSION.headers.update({
+    **_JSON_HEADERS,
+    # Block trees compress well; advertise every encoding urllib3 can decode here
+    # (gzip/deflate, plus br/zstd when those packages are installed)
+    "Accept-Encoding": requests.utils.DEFAULT_ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+})
+
+# Inserts rejected with 429 (never applied) are retried this many times
+INSERT_RATE_LIMIT_RETRIES = 3
+
+# Per-day GETs are independent, so lookback loops fetch them concurrently
+MAX_FETCH_WORKERS = 8
+
+# Daily note page IDs resolved during this run, keyed by (base_url, "today" / "2025-11-28")
+_DAILY_PAGE_CACHE = {}
+
+# Successful GET responses of the current run, keyed by (url, sorted params)
+_GET_CACHE = {}
+
+# Validators + bodies of conditional GETs, persisted across runs in ETAG_CACHE_PATH
+_ETAG_CACHE = None
+_ETAG_LOCK = threading.Lock()
+
 def load_config():
     if not os.path.exists(CONFIG_PATH):
         print(f"❌ Error: Config file not found at {CONFIG_PATH}")
@@ -31,40 +90,113 @@ def load_config():
     for key in config['api_urls']:
         config['api_urls'][key] = config['api_urls'][key].rstrip('/')
 
+    # Configure the Gemini client once for the whole run
+    genai.configure(api_key=config['gemini_api_key'])
+
     return config
 
 # --- 2. API Clients ---
 
-def get_ai_response(prompt, api_key, model_name="gemini-2.5-flash"):
-    genai.configure(api_key=api_key)
-    # Use configured model
+@functools.lru_cache(maxsize=4)
+def _get_model(model_name):
+    return genai.GenerativeModel(model_name)
+
+def get_ai_response(prompt, model_name="gemini-2.5-flash"):
+    """Generates text with Gemini. The client is configured once in load_config()."""
     try:
-        model = genai.GenerativeModel(model_name)
-        response = model.generate_content(prompt)
+        response = _get_model(model_name).generate_content(prompt)
         return response.text
     except Exception as e:
         print(f"❌ AI Error: {e}")
         return None
 
-def fetch_blocks(base_url, params=None):
-    """Generic fetch wrapper for multi-document API."""
+def cached_get(url, **kwargs):
+    """
+    SESSION.get memoized for the current run, so identical GETs are only sent once.
+    Only successful responses are kept; insert_blocks clears the cache after a write.
+    """
+    key = (url, tuple(sorted((kwargs.get('params') or {}).items())))
+    if key in _GET_CACHE:
+        return _GET_CACHE[key]
+    response = SESSION.get(url, **kwargs)
+    if response.ok:
+        _GET_CACHE[key] = response
+    return response
+
+def _load_etag_cache():
+    global _ETAG_CACHE
+    if _ETAG_CACHE is None:
+        try:
+            with open(ETAG_CACHE_PATH, 'rb') as f:
+                _ETAG_CACHE = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            _ETAG_CACHE = {}
+    return _ETAG_CACHE
+
+def conditional_get(url, params=None):
+    """
+    GET that revalidates against the on-disk ETag/Last-Modified cache.
+    Returns the response body bytes (the cached copy on 304 Not Modified).
+    Raises requests.exceptions.HTTPError on error responses.
+    """
+    key = url
+    if params:
+        key += "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+    with _ETAG_LOCK:
+        entry = _load_etag_cache().get(key)
+
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = SESSION.get(url, headers=headers, params=params)
+    if response.status_code == 304 and entry:
+        return entry["body"].encode("utf-8")
+    response.raise_for_status()
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        with _ETAG_LOCK:
+            cache = _load_etag_cache()
+            cache[key] = {"etag": etag, "last_modified": last_modified, "body": response.text}
+            try:
+                with open(ETAG_CACHE_PATH, 'wb') as f:
+                    f.write(orjson.dumps(cache))
+            except OSError as e:
+                print(f"⚠️  Could not write HTTP cache: {e}")
+    return response.content
+
+def fetch_blocks(base_url, params=None, revalidate=False):
+    """
+    Generic fetch wrapper for multi-document API.
+    With revalidate=True the request goes through the ETag cache (see conditional_get).
+    """
     url = f"{base_url}/blocks"
     if not params:
         params = {}
     if 'maxDepth' not in params:
         params['maxDepth'] = 1  # Default depth
-    headers = {"Content-Type": "application/json"}
 
+    body = b""
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
+        if revalidate:
+            body = conditional_get(url, params)
+        else:
+            response = cached_get(url, params=params)
+            response.raise_for_status()
+            body = response.content
 
         # Check if response has content
-        if not response.text:
+        if not body:
             print(f"⚠️  Empty response from {url}")
             return []
 
-        data = response.json()
+        data = orjson.loads(body)
         # Multi-document API can return either a document with content or items list
         if "content" in data:
             return data.get("content", [])
@@ -75,50 +207,62 @@ def fetch_blocks(base_url, params=None):
     except requests.exceptions.HTTPError as e:
         print(f"⚠️  HTTP Error: {e.response.status_code} - {e.response.text[:200]}")
         return []
-    except requests.exceptions.JSONDecodeError as e:
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️  Request Error: {e}")
+        return []
+    except orjson.JSONDecodeError as e:
         print(f"⚠️  JSON Error: {e}")
-        print(f"    Response text: {response.text[:200]}")
+        print(f"    Response text: {body[:200].decode('utf-8', 'replace')}")
         return []
 
+def resolve_daily_page_id(base_url, date_val):
+    """Returns the page ID of the daily note for date_val, fetching it only if not already known."""
+    cache_key = (base_url, date_val)
+    if cache_key in _DAILY_PAGE_CACHE:
+        return _DAILY_PAGE_CACHE[cache_key]
+
+    try:
+        resp = cached_get(f"{base_url}/blocks", params={"date": date_val, "maxDepth": 0})
+        if not resp.ok:
+            print(f"⚠️  Could not fetch daily note for {date_val}")
+            return None
+        page_id = orjson.loads(resp.content).get("id")
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        print(f"⚠️  Error fetching page ID: {e}")
+        return None
+
+    if not page_id:
+        print("⚠️  Could not get page ID for date")
+        return None
+    _DAILY_PAGE_CACHE[cache_key] = page_id
+    return page_id
+
 def insert_blocks(base_url, blocks, target_location):
     """
     Inserts blocks to multi-document API.
     target_location format:
     - For daily notes: {"date": "today", "position_type": "start"}
+      (add "page_id" if the daily note's ID is already known to skip the lookup)
     - For pages: {"page_id": "...", "position_type": "end"}
     """
     url = f"{base_url}/blocks"
-    headers = {"Content-Type": "application/json"}
 
     payload = {"blocks": blocks}
 
     # Handle different target location formats
     if "date" in target_location:
-        # Daily notes with date - need to get page ID first
+        # Daily notes with date - need the page ID (lookup is skipped when already known)
         date_val = target_location["date"]
         position_type = target_location.get("position_type", "start")
 
-        # Fetch the page ID for this date
-        try:
-            resp = requests.get(url, headers=headers, params={"date": date_val, "maxDepth": 0})
-            if resp.ok:
-                page_data = resp.json()
-                page_id = page_data.get("id")
-                if page_id:
-                    payload["date"] = date_val
-                    payload["position"] = {
-                        "position": position_type,
-                        "pageId": page_id
-                    }
-                else:
-                    print("⚠️  Could not get page ID for date")
-                    return None
-            else:
-                print(f"⚠️  Could not fetch daily note for {date_val}")
-                return None
-        except Exception as e:
-            print(f"⚠️  Error fetching page ID: {e}")
+        page_id = target_location.get("page_id") or resolve_daily_page_id(base_url, date_val)
+        if not page_id:
             return None
+        payload["date"] = date_val
+        payload["position"] = {
+            "position": position_type,
+            "pageId": page_id
+        }
 
     elif "page_id" in target_location:
         # Inserting into a specific page
@@ -129,70 +273,114 @@ def insert_blocks(base_url, blocks, target_location):
         }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        # Serialize once with orjson and send the bytes as-is
+        body = orjson.dumps(payload)
+        response = SESSION.post(url, headers=_JSON_HEADERS, data=body, timeout=30)
+        for attempt in range(INSERT_RATE_LIMIT_RETRIES):
+            if response.status_code != 429:
+                break
+            time.sleep(0.5 * (2 ** attempt))
+            response = SESSION.post(url, headers=_JSON_HEADERS, data=body, timeout=30)
+        # Anything read before this write may now be stale
+        _GET_CACHE.clear()
         response.raise_for_status()
 
-        if not response.text:
+        if not response.content:
             print(f"⚠️  Empty response after insert")
             return None
 
-        return response.json()
+        return orjson.loads(response.content)
     except requests.exceptions.HTTPError as e:
         print(f"❌ Craft API Write Error: {e.response.status_code}")
         print(f"    Response: {e.response.text[:300]}")
         return None
-    except requests.exceptions.JSONDecodeError as e:
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Craft API Write Error: {e}")
+        return None
+    except orjson.JSONDecodeError as e:
         print(f"⚠️  JSON decode error after insert: {e}")
         print(f"    Response text: {response.text[:300]}")
         return None
 
 # --- 3. Monthly Logic ---
 
+@functools.lru_cache(maxsize=4)
 def get_monthly_doc_id(base_url):
-    """Get the document ID for the monthly logs document."""
+    """Get the document ID for the monthly logs document (cached per run)."""
     try:
-        # Try to get documents list (multi-document API)
+        # Try to get documents list (multi-document API), revalidated via ETag
         url = f"{base_url}/documents"
-        response = requests.get(url, headers={"Content-Type": "application/json"})
-        if response.ok:
-            data = response.json()
+        try:
+            data = orjson.loads(conditional_get(url))
             if "items" in data and len(data["items"]) > 0:
                 return data["items"][0]["id"]
+        except requests.exceptions.RequestException:
+            pass
 
         # Fallback: try to fetch blocks and extract ID from response
         url = f"{base_url}/blocks"
-        response = requests.get(url, headers={"Content-Type": "application/json"}, params={"maxDepth": 0})
+        response = cached_get(url, params={"maxDepth": 0})
         if response.ok:
-            data = response.json()
+            data = orjson.loads(response.content)
             if "id" in data:
                 return data["id"]
-    except:
-        pass
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        print(f"⚠️  Could not look up monthly document: {e}")
     return None
 
-def ensure_month_page(base_url):
+# Day number of a monthly log entry, e.g. "**Friday 28:** ..." -> 28
+_DAY_RE = re.compile(r"^\*\*\w+\s+(\d{1,2})\s*:")
+
+@dataclass
+class MonthlyState:
+    """Snapshot of the Monthly Doc for the current month, loaded once per mode."""
+    doc_id: Optional[str] = None
+    month_page_id: Optional[str] = None
+    existing_days: set = field(default_factory=set)
+    root_blocks: list = field(default_factory=list)
+    month_blocks: list = field(default_factory=list)
+
+def load_monthly_state(monthly_url):
+    """
+    Reads the Monthly Doc once (root blocks + one level of page content) and
+    locates the current month page and the days already logged on it.
+    """
+    state = MonthlyState(doc_id=get_monthly_doc_id(monthly_url))
+    if not state.doc_id:
+        return state
+
+    # Depth 2: month pages plus their one-line entries; nothing deeper is read
+    state.root_blocks = fetch_blocks(monthly_url, {"id": state.doc_id, "maxDepth": 2}, revalidate=True)
+
+    for block in state.root_blocks:
+        if block.get("markdown", "").strip() == CURRENT_MONTH_NAME:
+            state.month_page_id = block.get("id")
+            state.month_blocks = block.get("content", [])
+            # Check existing entries
+            for entry in state.month_blocks:
+                # Extract day number from "**Friday 28:**" format
+                m = _DAY_RE.match(entry.get("markdown", ""))
+                if m:
+                    state.existing_days.add(int(m.group(1)))
+            break
+
+    return state
+
+def ensure_month_page(base_url, state):
     """
     Checks if a page for 'November 2025' exists in the Monthly Doc.
-    If not, creates it. Returns the pageId.
+    If not, creates it and records it on state. Returns the pageId.
     """
-    current_month_name = datetime.datetime.now().strftime("%B %Y")
+    current_month_name = CURRENT_MONTH_NAME
 
-    # Get the monthly document ID first
-    doc_id = get_monthly_doc_id(base_url)
-    if not doc_id:
+    if state.month_page_id:
+        print(f"   ✓ Found existing page for {current_month_name}")
+        return state.month_page_id
+
+    if not state.doc_id:
         print("❌ Could not find monthly document ID")
         return None
 
-    # Read root blocks of the Monthly Document
-    root_blocks = fetch_blocks(base_url, {"id": doc_id, "maxDepth": 1})
-
-    # Search for existing month page
-    for block in root_blocks:
-        md = block.get("markdown", "")
-        if md.strip() == current_month_name:
-            print(f"   ✓ Found existing page for {current_month_name}")
-            return block.get("id")
-
     # Create if missing
     print(f"   + Creating new page for {current_month_name}...")
     new_page_block = [{
@@ -202,171 +390,180 @@ def ensure_month_page(base_url):
     }]
 
     # Insert at top of Monthly Log doc
-    result = insert_blocks(base_url, new_page_block, {"page_id": doc_id, "position_type": "start"})
+    result = insert_blocks(base_url, new_page_block, {"page_id": state.doc_id, "position_type": "start"})
     if result and "items" in result:
-        return result["items"][0]["id"]
+        state.month_page_id = result["items"][0]["id"]
+        return state.month_page_id
     return None
 
 # --- 4. Helpers ---
 
-def extract_todos(blocks):
-    """Recursively extract unfinished tasks from blocks."""
-    todos = []
-    for block in blocks:
+def _fetch_day(daily_url, date_str, max_depth):
+    """Fetch the blocks of one daily note. Returns None if the note could not be read."""
+    try:
+        resp = cached_get(f"{daily_url}/blocks", params={"date": date_str, "maxDepth": max_depth})
+        if resp.ok:
+            return orjson.loads(resp.content).get("content", [])
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        print(f"⚠️  Could not read daily note for {date_str}: {e}")
+    return None
+
+def fetch_days(daily_url, date_strs, max_depth):
+    """Fetch several daily notes concurrently. Results keep the order of date_strs."""
+    if not date_strs:
+        return []
+    fetch = functools.partial(_fetch_day, daily_url, max_depth=max_depth)
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(date_strs))) as ex:
+        return list(ex.map(fetch, date_strs))
+
+def extract_tasks_by_state(blocks):
+    """
+    Walks the block tree once (including nested content) and sorts tasks by state.
+    Returns (todos, done, canceled) as lists of markdown, in document order.
+    """
+    todos, done, canceled = [], [], []
+    by_state = {"todo": todos, "done": done, "canceled": canceled}
+
+    # Explicit stack instead of recursion; children are pushed reversed to keep document order
+    stack = deque(reversed(blocks))
+    while stack:
+        block = stack.pop()
         if block.get("listStyle") == "task":
-            task_info = block.get("taskInfo", {})
-            if task_info.get("state") == "todo":
-                todos.append(block.get("markdown", ""))
-        # Recursive check if deep fetching
-        if "content" in block and isinstance(block["content"], list):
-            todos.extend(extract_todos(block["content"]))
-    return todos
+            bucket = by_state.get((block.get("taskInfo") or {}).get("state"))
+            if bucket is not None:
+                bucket.append(block.get("markdown", ""))
+        children = block.get("content")
+        if isinstance(children, list):
+            stack.extend(reversed(children))
+    return todos, done, canceled
+
+def extract_todos(blocks):
+    """Extract unfinished tasks from blocks (including nested content)."""
+    return extract_tasks_by_state(blocks)[0]
 
 def extract_completed_tasks(blocks):
-    """Recursively extract completed tasks from blocks."""
-    completed = []
-    for block in blocks:
-        if block.get("listStyle") == "task":
-            task_info = block.get("taskInfo", {})
-            if task_info.get("state") == "done":
-                completed.append(block.get("markdown", ""))
-        # Recursive check if deep fetching
-        if "content" in block and isinstance(block["content"], list):
-            completed.extend(extract_completed_tasks(block["content"]))
-    return completed
-
-def extract_content_with_state(blocks, max_blocks=50):
-    """Extracts markdown from blocks, adding [x]/[ ] for tasks."""
-    lines = []
-    for block in blocks[:max_blocks]:
-        md = block.get("markdown", "")
-        
-        # Add task state if applicable
+    """Extract completed tasks from blocks (including nested content)."""
+    return extract_tasks_by_state(blocks)[1]
+
+# Checkbox prefix for each task state in summarization input
+_TASK_PREFIX = {"done": "[x] ", "todo": "[ ] ", "canceled": "[-] "}
+
+def extract_content_with_state(blocks, max_blocks=50, max_chars=4000):
+    """Extracts markdown from blocks, adding [x]/[ ] for tasks. Stops once max_chars is reached."""
+    return render_and_collect(blocks, max_blocks, max_chars)[0]
+
+def render_and_collect(blocks, max_blocks=50, max_chars=4000):
+    """
+    One pass over the block tree that renders the first max_blocks top-level blocks
+    (like extract_content_with_state, up to max_chars) and collects tasks from the
+    whole tree (like extract_tasks_by_state). Returns (joined_markdown, todos, done).
+    """
+    lines, todos, done = [], [], []
+    _append = lines.append
+    total = 0
+
+    # (block, render) pairs; only top-level blocks within max_blocks are rendered
+    stack = deque((block, i < max_blocks) for i, block in reversed(list(enumerate(blocks))))
+    while stack:
+        block, render = stack.pop()
+        md = block.get("markdown")
+
         if block.get("listStyle") == "task":
-            state = block.get("taskInfo", {}).get("state")
-            if state == "done":
-                md = f"[x] {md}"
-            elif state == "todo":
-                md = f"[ ] {md}"
-            elif state == "canceled":
-                md = f"[-] {md}"
-        
-        if md:
-            lines.append(md)
-            
-    return "\n".join(lines)
+            state = (block.get("taskInfo") or {}).get("state")
+            if state == "todo":
+                todos.append(md or "")
+            elif state == "done":
+                done.append(md or "")
+            if render and md:
+                md = _TASK_PREFIX.get(state, "") + md
+
+        # Past the character budget only task collection continues
+        if render and md and total < max_chars:
+            _append(md)
+            total += len(md) + 1
+
+        children = block.get("content")
+        if isinstance(children, list):
+            stack.extend((child, False) for child in reversed(children))
+
+    return "\n".join(lines), todos, done
 
 def get_unfinished_tasks(days, daily_url):
     """Fetch unfinished tasks from the last N days."""
     context_lines = []
     today = datetime.date.today()
+    date_strs = [(today - datetime.timedelta(days=i)).isoformat() for i in range(1, days + 1)]
 
-    for i in range(1, days + 1):
-        past_date = today - datetime.timedelta(days=i)
-        date_str = past_date.strftime("%Y-%m-%d")
-
-        url = f"{daily_url}/blocks"
-        try:
-            resp = requests.get(url, headers={"Content-Type": "application/json"},
-                              params={"date": date_str, "maxDepth": 5})
-            if resp.ok:
-                blocks = resp.json().get("content", [])
-                todos = extract_todos(blocks)
-                if todos:
-                    context_lines.append(f"Unfinished from {date_str}:")
-                    for t in todos:
-                        context_lines.append(f"- {t}")
-        except:
+    # Depth 3 reaches tasks nested inside toggles/sub-tasks, same as the evening summary reads
+    for date_str, blocks in zip(date_strs, fetch_days(daily_url, date_strs, max_depth=3)):
+        if blocks is None:
             continue
+        todos = extract_todos(blocks)
+        if todos:
+            context_lines.append(f"Unfinished from {date_str}:")
+            for t in todos:
+                context_lines.append(f"- {t}")
 
     if not context_lines:
         return "No unfinished tasks found."
     return "\n".join(context_lines)
 
-def get_recent_daily_notes(days, daily_url):
-    """Fetch actual content from recent daily notes (not just tasks)."""
+def get_recent_daily_notes(days, daily_url, max_chars=4000):
+    """Fetch actual content from recent daily notes (not just tasks), newest first, up to max_chars in total."""
     notes = []
+    total = 0
     today = datetime.date.today()
+    past_dates = [today - datetime.timedelta(days=i) for i in range(1, days + 1)]
+    date_strs = [d.isoformat() for d in past_dates]
 
-    for i in range(1, days + 1):
-        past_date = today - datetime.timedelta(days=i)
-        date_str = past_date.strftime("%Y-%m-%d")
+    # Only top-level blocks are read below, so their children aren't needed
+    for past_date, blocks in zip(past_dates, fetch_days(daily_url, date_strs, max_depth=1)):
+        if blocks is None:
+            continue
         readable_date = past_date.strftime("%A, %B %d")
 
-        url = f"{daily_url}/blocks"
-        try:
-            resp = requests.get(url, headers={"Content-Type": "application/json"},
-                              params={"date": date_str, "maxDepth": 2})
-            if resp.ok:
-                data = resp.json()
-                blocks = data.get("content", [])
-
-                # Extract meaningful content (skip empty, headers, tasks)
-                content_pieces = []
-                for block in blocks[:20]:  # Limit to first 20 blocks
-                    md = block.get("markdown", "").strip()
-                    if md and len(md) > 10:  # Skip very short blocks
-                        # Skip common headers
-                        if not md.startswith("##") and not md.startswith("---"):
-                            content_pieces.append(md)
-
-                if content_pieces:
-                    note_summary = "\n".join(content_pieces[:5])  # Max 5 pieces
-                    notes.append(f"**{readable_date}:**\n{note_summary}")
-        except:
-            continue
+        # Extract meaningful content (skip empty, headers, tasks)
+        content_pieces = []
+        for block in blocks[:20]:  # Limit to first 20 blocks
+            md = block.get("markdown", "").strip()
+            if md and len(md) > 10:  # Skip very short blocks
+                # Skip common headers
+                if not md.startswith("##") and not md.startswith("---"):
+                    content_pieces.append(md)
+
+        if content_pieces:
+            note_summary = "\n".join(content_pieces[:5])  # Max 5 pieces
+            notes.append(f"**{readable_date}:**\n{note_summary}")
+            total += len(notes[-1]) + 2
+            if total >= max_chars:
+                break
 
     if not notes:
         return "No recent daily notes found."
     return "\n\n".join(notes)
 
-def get_monthly_context(monthly_url):
+def get_monthly_context(state):
     """
     Read the current month's page from Monthly Doc to get progressive summaries.
     This provides the narrative arc that empowers morning briefings.
     """
-    current_month_name = datetime.datetime.now().strftime("%B %Y")
+    current_month_name = CURRENT_MONTH_NAME
 
-    # Get the monthly document ID first
-    doc_id = get_monthly_doc_id(monthly_url)
-    if not doc_id:
+    if not state.doc_id:
         return f"Could not access monthly document."
 
-    # Fetch root blocks to find month page
-    root_blocks = fetch_blocks(monthly_url, {"id": doc_id, "maxDepth": 1})
-
-    month_page_id = None
-    for block in root_blocks:
-        md = block.get("markdown", "")
-        if md.strip() == current_month_name:
-            month_page_id = block.get("id")
-            break
-
-    if not month_page_id:
+    if not state.month_page_id:
         return f"No monthly summaries found for {current_month_name} yet."
 
-    # Fetch content of the month page
-    try:
-        url = f"{monthly_url}/blocks"
-        resp = requests.get(url, headers={"Content-Type": "application/json"},
-                          params={"id": month_page_id, "maxDepth": 2})
-        if resp.ok:
-            data = resp.json()
-            blocks = data.get("content", [])
-            summaries = []
-            for block in blocks:
-                md = block.get("markdown", "").strip()
-                if md and not md.startswith("#"):  # Skip headers
-                    summaries.append(md)
-
-            if summaries:
-                return "\n".join(summaries)
-            else:
-                return f"Month page exists for {current_month_name}, but no summaries logged yet."
-    except Exception as e:
-        print(f"⚠️  Error reading month page: {e}")
+    summaries = []
+    for block in state.month_blocks:
+        md = block.get("markdown", "").strip()
+        if md and not md.startswith("#"):  # Skip headers
+            summaries.append(md)
 
-    return f"Could not read monthly summaries for {current_month_name}."
+    if summaries:
+        return "\n".join(summaries)
+    return f"Month page exists for {current_month_name}, but no summaries logged yet."
 
 # --- 5. Modes ---
 
@@ -376,22 +573,29 @@ def mode_morning(config):
     Reads monthly summaries + recent daily notes + unfinished tasks.
     """
     print("☀️ Running Morning Routine...")
+    _GET_CACHE.clear()
     daily_url = config['api_urls']['daily_notes']
     monthly_url = config['api_urls']['monthly_doc']
 
-    # 1. Fetch Monthly Context (progressive summaries)
-    print("📅 Reading monthly summaries...")
-    monthly_context = get_monthly_context(monthly_url)
-
-    # 2. Fetch Recent Daily Notes Content
     lookback_notes = config['settings']['morning'].get('lookback_days_notes', 2)
-    print(f"📖 Reading last {lookback_notes} days' notes...")
-    recent_notes = get_recent_daily_notes(lookback_notes, daily_url)
-
-    # 3. Fetch Unfinished Tasks
     lookback_tasks = config['settings']['morning'].get('lookback_days_tasks', 3)
+    notes_char_budget = config['settings']['morning'].get('prompt_char_budget', 4000)
+
+    # 1-3. Monthly context, recent notes and unfinished tasks are independent,
+    # so fetch them side by side over the shared session
+    print("📅 Reading monthly summaries...")
+    print(f"📖 Reading last {lookback_notes} days' notes...")
     print(f"📥 Checking last {lookback_tasks} days for unfinished tasks...")
-    tasks_context = get_unfinished_tasks(lookback_tasks, daily_url)
+    # Today's page ID is resolved alongside them so the final insert needs no lookup
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        monthly_future = ex.submit(load_monthly_state, monthly_url)
+        notes_future = ex.submit(get_recent_daily_notes, lookback_notes, daily_url, notes_char_budget)
+        tasks_future = ex.submit(get_unfinished_tasks, lookback_tasks, daily_url)
+        today_page_future = ex.submit(resolve_daily_page_id, daily_url, "today")
+        monthly_context = get_monthly_context(monthly_future.result())
+        recent_notes = notes_future.result()
+        tasks_context = tasks_future.result()
+        today_page_id = today_page_future.result()
 
     # 4. Generate Briefing
     today_str = datetime.datetime.now().strftime("%A, %B %d")
@@ -402,7 +606,7 @@ def mode_morning(config):
         date=today_str
     )
     model_name = config.get('model_name', 'gemini-2.5-flash')
-    briefing_md = get_ai_response(prompt, config['gemini_api_key'], model_name)
+    briefing_md = get_ai_response(prompt, model_name)
 
     if briefing_md:
         print("📝 Writing briefing to Daily Note as sub-page...")
@@ -415,47 +619,25 @@ def mode_morning(config):
                 {"type": "text", "markdown": briefing_md}
             ]
         }]
-        insert_blocks(daily_url, briefing_page, {"date": "today", "position_type": "end"})
+        insert_blocks(daily_url, briefing_page,
+                      {"date": "today", "page_id": today_page_id, "position_type": "end"})
         print("✅ Morning briefing complete.")
 
-def backfill_month(config, daily_url, monthly_url):
+def backfill_month(config, daily_url, monthly_url, state):
     """
     Backfill missing days of the current month with summaries.
     Called on first run or when monthly log has gaps.
     """
     print("\n📦 Checking for backfill needs...")
 
-    # Get existing month entries
-    doc_id = get_monthly_doc_id(monthly_url)
-    if not doc_id:
+    if not state.doc_id:
         print("⚠️  Could not access monthly doc for backfill")
         return
 
-    current_month_name = datetime.datetime.now().strftime("%B %Y")
-    root_blocks = fetch_blocks(monthly_url, {"id": doc_id, "maxDepth": 2})
-
-    # Find month page and existing entries
-    month_page_id = None
-    existing_days = set()
-
-    for block in root_blocks:
-        if block.get("markdown", "").strip() == current_month_name:
-            month_page_id = block.get("id")
-            # Check existing entries
-            for entry in block.get("content", []):
-                md = entry.get("markdown", "")
-                # Extract day number from "**Friday 28:**" format
-                if "**" in md and ":" in md:
-                    try:
-                        day_part = md.split("**")[1].split(":")[0].strip()
-                        day_num = int(day_part.split()[-1])  # Get last word (the number)
-                        existing_days.add(day_num)
-                    except:
-                        pass
-            break
-
+    existing_days = state.existing_days
+    month_page_id = state.month_page_id
     if not month_page_id:
-        month_page_id = ensure_month_page(monthly_url)
+        month_page_id = ensure_month_page(monthly_url, state)
 
     # Determine days to backfill (1st of month to yesterday)
     today = datetime.datetime.now()
@@ -474,48 +656,67 @@ def backfill_month(config, daily_url, monthly_url):
     print(f"📝 Backfilling {len(days_to_fill)} days...")
 
     max_words = config['settings']['evening'].get('summary_max_words', 25)
-
-    for date_obj in days_to_fill:
-        date_str = date_obj.strftime("%Y-%m-%d")
-        day_str = date_obj.strftime("%A %d")
-
-        # Fetch that day's content
-        try:
-            url = f"{daily_url}/blocks"
-            resp = requests.get(url, headers={"Content-Type": "application/json"},
-                              params={"date": date_str, "maxDepth": 3})
-
-            if resp.ok:
-                blocks = resp.json().get("content", [])
-                content_snippet = extract_content_with_state(blocks, max_blocks=50)
-
-                if content_snippet.strip():
-                    # Extract completed tasks for backfill
-                    completed_tasks_list = extract_completed_tasks(blocks)
-                    completed_tasks_str = "\n".join([f"- {t}" for t in completed_tasks_list]) if completed_tasks_list else "No tasks marked as completed."
-
-                    # Generate summary
-                    prompt = config['prompts']['evening_summary'].format(
-                        context=content_snippet,
-                        completed_tasks=completed_tasks_str,
-                        max_words=max_words
-                    )
-                    model_name = config.get('model_name', 'gemini-2.5-flash')
-                    summary = get_ai_response(prompt, config['gemini_api_key'], model_name)
-
-                    if summary:
-                        summary = summary.strip().strip('"').strip("'").strip()
-                        entry_md = f"**{day_str}:** {summary}"
-
-                        # Insert into monthly doc
-                        insert_blocks(monthly_url,
-                                    [{"type": "text", "markdown": entry_md}],
-                                    {"page_id": month_page_id, "position_type": "end"})
-                        print(f"   ✓ Backfilled {day_str}")
-        except Exception as e:
-            print(f"   ⚠️  Could not backfill {day_str}: {e}")
+    char_budget = config['settings']['evening'].get('prompt_char_budget', 4000)
+
+    # Fetch all missing days' content up front
+    date_strs = [d.isoformat() for d in days_to_fill]
+    # Depth 3: top-level notes for the prompt plus nested completed tasks
+    day_blocks = fetch_days(daily_url, date_strs, max_depth=3)
+
+    # Build one summary prompt per day that has notes; empty days get a fixed entry
+    summaries = {}
+    prompts = []
+    for date_obj, blocks in zip(days_to_fill, day_blocks):
+        if blocks is None:
+            continue
+        # Render notes and extract completed tasks in one pass
+        content_snippet, _, completed_tasks_list = render_and_collect(blocks, max_blocks=50, max_chars=char_budget)
+        if not content_snippet.strip() and not completed_tasks_list:
+            summaries[date_obj] = "No activity recorded."
             continue
 
+        completed_tasks_str = "\n".join([f"- {t}" for t in completed_tasks_list]) if completed_tasks_list else "No tasks marked as completed."
+
+        prompt = config['prompts']['evening_summary'].format(
+            context=content_snippet,
+            completed_tasks=completed_tasks_str,
+            max_words=max_words
+        )
+        prompts.append((date_obj, prompt))
+
+    # Generate summaries concurrently (bounded to stay within Gemini rate limits)
+    if prompts:
+        model_name = config.get('model_name', 'gemini-2.5-flash')
+        ai_concurrency = config['settings']['evening'].get('ai_concurrency', 4)
+        with ThreadPoolExecutor(max_workers=max(1, ai_concurrency)) as ex:
+            futures = {
+                ex.submit(get_ai_response, prompt, model_name): date_obj
+                for date_obj, prompt in prompts
+            }
+            for future in as_completed(futures):
+                date_obj = futures[future]
+                summary = future.result()  # get_ai_response returns None on failure
+                if summary:
+                    summaries[date_obj] = summary.strip().strip('"').strip("'").strip()
+                else:
+                    print(f"   ⚠️  Could not backfill {date_obj.strftime('%A %d')}: no summary generated")
+
+    # Insert all entries in one request, in chronological order so the month page reads top to bottom
+    filled_dates = sorted(summaries)
+    day_strs = [d.strftime("%A %d") for d in filled_dates]
+    all_entries = [
+        {"type": "text", "markdown": f"**{day_str}:** {summaries[date_obj]}"}
+        for date_obj, day_str in zip(filled_dates, day_strs)
+    ]
+
+    if all_entries:
+        result = insert_blocks(monthly_url, all_entries,
+                               {"page_id": month_page_id, "position_type": "end"})
+        if result is not None:
+            state.existing_days.update(d.day for d in filled_dates)
+            for day_str in day_strs:
+                print(f"   ✓ Backfilled {day_str}")
+
     print("✅ Backfill complete\n")
 
 def mode_evening(config):
@@ -525,42 +726,51 @@ def mode_evening(config):
     Backfills missing days if configured.
     """
     print("🌙 Running Evening Progressive Summarization...")
+    _GET_CACHE.clear()
     daily_url = config['api_urls']['daily_notes']
     monthly_url = config['api_urls']['monthly_doc']
 
+    # Read the Monthly Doc once; backfill and logging both work from this snapshot
+    monthly_state = load_monthly_state(monthly_url)
+
     # Backfill check (if enabled and needed)
     if config['settings']['evening'].get('backfill_on_first_run', False):
-        backfill_month(config, daily_url, monthly_url)
+        backfill_month(config, daily_url, monthly_url, monthly_state)
 
     # 1. Fetch Today's Content
     print("📥 Reading today's notes...")
     try:
-        resp = requests.get(f"{daily_url}/blocks",
-                          headers={"Content-Type": "application/json"},
-                          params={"date": "today", "maxDepth": 3})
-        today_blocks = resp.json().get("content", [])
-    except:
-        today_blocks = []
-
-    content_snippet = extract_content_with_state(today_blocks, max_blocks=50)
+        resp = cached_get(f"{daily_url}/blocks", params={"date": "today", "maxDepth": 3})
+        resp.raise_for_status()
+        today_blocks = orjson.loads(resp.content).get("content", [])
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        # Don't log a failed read as an empty day; backfill picks today up on a later run
+        print(f"❌ Could not read today's notes, skipping summary: {e}")
+        return
+
+    # Render notes and extract completed tasks (for higher fidelity) in one pass
+    char_budget = config['settings']['evening'].get('prompt_char_budget', 4000)
+    content_snippet, _, completed_tasks_list = render_and_collect(today_blocks, max_blocks=50, max_chars=char_budget)
     if not content_snippet:
         content_snippet = "No notes recorded today."
 
     # 2. Generate ONE-LINE Summary
     print("🧠 Compressing to one-line summary...")
     
-    # Extract completed tasks for higher fidelity
-    completed_tasks_list = extract_completed_tasks(today_blocks)
-    completed_tasks_str = "\n".join([f"- {t}" for t in completed_tasks_list]) if completed_tasks_list else "No tasks marked as completed."
-    
-    max_words = config['settings']['evening'].get('summary_max_words', 15)
-    prompt = config['prompts']['evening_summary'].format(
-        context=content_snippet,
-        completed_tasks=completed_tasks_str,
-        max_words=max_words
-    )
-    model_name = config.get('model_name', 'gemini-2.5-flash')
-    summary = get_ai_response(prompt, config['gemini_api_key'], model_name)
+    if not completed_tasks_list and content_snippet == "No notes recorded today.":
+        # Nothing to summarize, so skip the Gemini call
+        summary = "Quiet day — no notes or completed tasks."
+    else:
+        completed_tasks_str = "\n".join([f"- {t}" for t in completed_tasks_list]) if completed_tasks_list else "No tasks marked as completed."
+
+        max_words = config['settings']['evening'].get('summary_max_words', 15)
+        prompt = config['prompts']['evening_summary'].format(
+            context=content_snippet,
+            completed_tasks=completed_tasks_str,
+            max_words=max_words
+        )
+        model_name = config.get('model_name', 'gemini-2.5-flash')
+        summary = get_ai_response(prompt, model_name)
 
     if summary:
         # Clean up the summary (remove quotes, extra whitespace)
@@ -570,7 +780,7 @@ def mode_evening(config):
         print("📅 Logging to Monthly Document...")
 
         # Find/Create Month Page
-        month_page_id = ensure_month_page(monthly_url)
+        month_page_id = ensure_month_page(monthly_url, monthly_state)
 
         if month_page_id:
             # Insert one-line entry with day of week and date prefix